@@ -1,36 +1,101 @@
 import os
 import sys
 import re
+import stat
+import mmap
 import logging
 from logging.handlers import RotatingFileHandler
 import traceback
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
 
 # ----- Logging ---------------------------------------------------------------
 LOG_DIR = Path("logs"); LOG_DIR.mkdir(exist_ok=True)
 LOG_FILE = LOG_DIR / "app.log"
 logger = logging.getLogger("searchex"); logger.setLevel(logging.INFO)
-_handler = RotatingFileHandler(LOG_FILE, maxBytes=2_000_000, backupCount=3, encoding="utf-8")
-_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
-logger.addHandler(_handler)
-logger.info("=== Start searchex ===")
+if multiprocessing.parent_process() is None:  # scan worker processes don't write the log
+    _handler = RotatingFileHandler(LOG_FILE, maxBytes=2_000_000, backupCount=3, encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    logger.addHandler(_handler)
+    logger.info("=== Start searchex ===")
 
 # ----- PySide6 ---------------------------------------------------------------
-from PySide6.QtCore import Qt, QRunnable, QThreadPool, Signal, QObject, QSize, Slot, QTimer
+from PySide6.QtCore import Qt, QRunnable, QThreadPool, Signal, QObject, QSize, Slot, QTimer, QPoint
 from PySide6.QtGui import QFont, QIcon
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
     QPushButton, QFileDialog, QPlainTextEdit, QCheckBox, QSpinBox, QLabel,
-    QListWidget, QListWidgetItem, QProgressBar, QMessageBox, QFrame, QSplitter
+    QListWidget, QListWidgetItem, QProgressBar, QMessageBox, QFrame, QSplitter,
+    QListView, QStyledItemDelegate
 )
 
 # ----- Native extension ------------------------------------------------------
+NATIVE_RESULT_LAYOUT = 2  # column-wise hits (patterns/pattern_ids/positions/lines), since 0.3.0
 try:
     from searchex import searchex_native as sx
 except Exception as e:
     sx = None
     logger.error("Failed to import searchex_native: %s", e)
+if sx is not None and getattr(sx, "result_layout", 1) != NATIVE_RESULT_LAYOUT:
+    # e.g. a 0.2.x wheel that still returns "hits"; rebuild the wheel to use it again
+    logger.error("searchex_native has result layout %s, expected %s; using the Python fallback",
+                 getattr(sx, "result_layout", 1), NATIVE_RESULT_LAYOUT)
+    sx = None
+
+# ----- Regex engines ---------------------------------------------------------
+# SEARCHEX_REGEX_ENGINE = auto | pcre2 | re2 | regex | re. "auto" prefers RE2 (linear
+# time, so no catastrophic backtracking), then PCRE2 with JIT for what RE2 rejects
+# (lookaround, backrefs), then the faster "regex" module, then stdlib re. Each pattern goes to the first engine that
+# accepts it, so under "auto" the dialect depends on the installed extras: e.g.
+# [[:alpha:]] and \Q..\E are POSIX class / quoting in PCRE2 but not in re.
+# Pinning pcre2, re2 or regex only limits the chain to that engine: patterns it rejects
+# still fall back to stdlib re. SEARCHEX_REGEX_ENGINE=re is the one fixed dialect.
+REGEX_ENGINE = os.environ.get("SEARCHEX_REGEX_ENGINE", "auto").lower()
+pcre2 = None
+if REGEX_ENGINE in ("auto", "pcre2"):
+    try:
+        import pcre2
+    except ImportError:
+        pass
+rx_engine = re
+if REGEX_ENGINE in ("auto", "regex"):
+    try:
+        import regex as rx_engine
+    except ImportError:
+        pass
+re2 = None
+if REGEX_ENGINE in ("auto", "re2"):
+    try:
+        import re2
+    except ImportError:
+        pass
+RX_ERRORS = tuple({re.error, rx_engine.error})
+logger.info("Regex engine: %s%s%s", "re2 + " if re2 else "", "pcre2 + " if pcre2 else "", rx_engine.__name__)
+
+# ----- Optional JIT for the literal scan -------------------------------------
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# ----- Optional multi-pattern automaton --------------------------------------
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+_hs_local = threading.local()  # Hyperscan scratch space is per thread
 
 # ----- Styling ---------------------------------------------------------------
 DARK_QSS = """
@@ -52,93 +117,411 @@ def hum_bytes(n: int) -> str:
         n /= 1024.0
     return f"{n:.0f}PB"
 
-def is_hidden(p: Path) -> bool:
+def is_hidden_entry(entry: os.DirEntry) -> bool:
+    # No extra syscall: on Windows the attributes come with the directory listing
     if os.name == "nt":
         try:
-            import ctypes
-            attrs = ctypes.windll.kernel32.GetFileAttributesW(str(p))
-            return bool(attrs & 2)
-        except Exception:
+            return bool(entry.stat(follow_symlinks=False).st_file_attributes & stat.FILE_ATTRIBUTE_HIDDEN)
+        except OSError:
             return False
-    return p.name.startswith(".")
+    return entry.name.startswith(".")
+
+def is_word_byte(c: int) -> bool:
+    # ASCII [A-Za-z0-9_], same rule as the native module
+    return c == 0x5F or 0x30 <= c <= 0x39 or 0x41 <= (c & ~0x20) <= 0x5A
+
+def newline_offsets(buf, chunk: int = 1 << 24) -> np.ndarray:
+    # Vectorized scan in fixed-size chunks, so the temporary mask stays small for huge files
+    arr = np.frombuffer(buf, dtype=np.uint8)
+    try:
+        parts = [np.flatnonzero(arr[i:i+chunk] == 0x0A) + i for i in range(0, arr.size, chunk)]
+    finally:
+        del arr  # release the buffer export before the caller closes the mmap
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+_COUNTED_REPEAT = re.compile(r"\{(\d+)(?:,(\d*))?\}")
+MAX_REPEAT_WEIGHT = 100_000
+
+def repeat_weight(pat) -> int:
+    # Product of all {n,m} counts: an upper bound for how far nested counted repeats blow up
+    # engines that expand them at compile time ("regex" runs out of memory on a{99999999})
+    text = pat.decode("latin-1") if isinstance(pat, bytes) else pat
+    w = 1
+    for lo, hi in _COUNTED_REPEAT.findall(text):
+        w *= max(int(lo), int(hi or 0)) or 1
+        if w > MAX_REPEAT_WEIGHT: break
+    return w
+
+@lru_cache(maxsize=256)
+def compile_rx(pat, flags: int = 0):
+    # pat may be str (names) or bytes (file contents); cached so all files share one compile
+    if re2 is not None:
+        ropts = re2.Options(); ropts.log_errors = False
+        ropts.case_sensitive = not (flags & re.IGNORECASE)
+        try:
+            return re2.compile(pat, ropts)
+        except re2.error:
+            pass  # backrefs, lookaround, ... -> backtracking engine
+    if pcre2 is not None:
+        try:
+            rx = pcre2.compile(pat, flags=pcre2.IGNORECASE if flags & re.IGNORECASE else 0)
+            rx.jit_compile()
+            return rx
+        except pcre2.error:
+            pass  # let the next engine report the error / try its own syntax
+    if rx_engine is not re and repeat_weight(pat) <= MAX_REPEAT_WEIGHT:
+        try:
+            return rx_engine.compile(pat, flags)
+        except MemoryError:
+            pass  # stdlib re keeps counted repeats compact
+    return re.compile(pat, flags)
+
+def match_starts(rx, buf) -> List[int]:
+    # Start offsets of all matches. RE2's finditer reports some empty matches twice
+    # ("$" at the end, "\b" between words), so an empty match repeating the previous one is dropped
+    starts, last = [], None
+    for m in rx.finditer(buf):
+        span = m.span()
+        if span[0] == span[1] and span == last: continue
+        starts.append(span[0]); last = span
+    return starts
+
+def new_result(path: str, patterns: List[str]) -> Dict[str, Any]:
+    # Hits are stored column-wise (SoA): hit k is patterns[pattern_ids[k]] at positions[k] on lines[k]
+    return {"path": path, "is_binary": False, "error": None, "file_size": 0, "patterns": patterns,
+            "pattern_ids": np.empty(0, dtype=np.int32), "positions": np.empty(0, dtype=np.int64),
+            "lines": np.empty(0, dtype=np.int32)}
+
+def compile_patterns(patterns: List[str], opts: Dict[str, Any]) -> List[Any]:
+    # Compiled once per search (content regexes work on bytes); None for literal mode
+    if not opts["use_regex"]:
+        return [None] * len(patterns)
+    flags = 0 if opts["case_sensitive"] else re.IGNORECASE
+    return [compile_rx(pat.encode("utf-8"), flags) for pat in patterns]
+
+scan_literal_nb = None
+if numba is not None:
+    _is_word_byte_nb = numba.njit(cache=True)(is_word_byte)
+
+    @numba.njit(cache=True)
+    def _append_nb(out, k, i):
+        if k == out.size: out = np.concatenate((out, np.empty(k, dtype=np.int64)))
+        out[k] = i
+        return out
+
+    @numba.njit(cache=True, nogil=True)
+    def _horspool_nb(hay, needle, fold, whole_word):
+        # Boyer-Moore-Horspool: skip by the distance from the window's last byte to its last
+        # occurrence in the needle (0 = candidate); both cases share an entry when folding
+        n, m = hay.size, needle.size
+        out = np.empty(64, dtype=np.int64); k = 0
+        skip = np.full(256, m, dtype=np.int64)
+        for j in range(m):
+            skip[needle[j]] = m - 1 - j
+            if fold and 97 <= needle[j] <= 122: skip[needle[j] - 32] = m - 1 - j
+        i = m - 1
+        while i < n:
+            s = skip[hay[i]]
+            while s:  # tight skip loop
+                i += s
+                if i >= n: return out[:k]
+                s = skip[hay[i]]
+            st = i - m + 1
+            j = 0
+            while j < m:
+                c = hay[st + j]
+                if fold and 65 <= c <= 90: c = c | 0x20
+                if c != needle[j]: break
+                j += 1
+            i += 1
+            if j < m: continue
+            if whole_word and ((st > 0 and _is_word_byte_nb(hay[st-1])) or (i < n and _is_word_byte_nb(hay[i]))):
+                continue
+            out = _append_nb(out, k, st); k += 1
+        return out[:k]
+
+    @numba.njit(cache=True, nogil=True)
+    def _swar_nb(hay, words, needle, r, fold, whole_word):
+        # Test 8 positions per step for needle[r]: v = word ^ broadcast(byte) has a zero byte
+        # where it occurs, flagged by (v - 0x01..) & ~v & 0x80..; only flagged words are verified
+        n, m = hay.size, needle.size
+        out = np.empty(64, dtype=np.int64); k = 0
+        lo = np.uint64(0x0101010101010101); hi = np.uint64(0x8080808080808080)
+        c0 = needle[r]
+        c1 = c0 - 32 if fold and 97 <= c0 <= 122 else c0
+        b0 = np.uint64(c0) * lo; b1 = np.uint64(c1) * lo
+        nw = words.size
+        q = 0
+        while q <= nw:
+            while q < nw:  # tight loop over words without a flagged lane
+                v = words[q] ^ b0; w = words[q] ^ b1
+                if ((v - lo) & ~v & hi) | ((w - lo) & ~w & hi): break
+                q += 1
+            p0 = q * 8; p1 = min(p0 + 8, n)  # q == nw: the tail that does not fill a word
+            q += 1
+            for p in range(p0, p1):
+                i = p - r
+                if i < 0 or i > n - m: continue
+                j = 0
+                while j < m:
+                    c = hay[i + j]
+                    if fold and 65 <= c <= 90: c = c | 0x20
+                    if c != needle[j]: break
+                    j += 1
+                if j < m: continue
+                if whole_word and ((i > 0 and _is_word_byte_nb(hay[i-1])) or (i + m < n and _is_word_byte_nb(hay[i+m]))):
+                    continue
+                out = _append_nb(out, k, i); k += 1
+        return out[:k]
+
+    @numba.njit(cache=True, nogil=True)
+    def scan_literal_nb(hay, words, needle, fold, whole_word):
+        # hay/needle: uint8 arrays, needle already lowercased when fold is set;
+        # words: the whole 8-byte words of hay as uint64.
+        # Runs without the GIL, so pool threads scan in parallel.
+        n, m = hay.size, needle.size
+        if m == 0 or m > n: return np.empty(0, dtype=np.int64)
+        if m > 8: return _horspool_nb(hay, needle, fold, whole_word)
+        # Short needles shift too little for Horspool; filter on the needle byte
+        # that is rarest in the first 64 KB instead
+        counts = np.zeros(256, dtype=np.int64)
+        for c in hay[:1 << 16]:
+            counts[c | 0x20 if fold and 65 <= c <= 90 else c] += 1
+        r = 0
+        for j in range(1, m):
+            if counts[needle[j]] < counts[needle[r]]: r = j
+        return _swar_nb(hay, words, needle, r, fold, whole_word)
+
+def build_automaton(patterns: List[str], fold: bool):
+    # Keys are the UTF-8 bytes of each pattern seen as latin-1 text, so string
+    # indices in a latin-1 decoded file are byte offsets. Value: (key length, pattern indices)
+    A = ahocorasick.Automaton()
+    for idx, pat in enumerate(patterns):
+        key = pat.encode("utf-8")
+        if fold: key = key.lower()
+        key = key.decode("latin-1")
+        n, ids = A.get(key, (len(key), []))
+        ids.append(idx)
+        A.add_word(key, (n, ids))
+    A.make_automaton()
+    return A
+
+def scan_automaton(buf, A, count: int, longest: int, fold: bool, whole_word: bool,
+                   chunk: int = 1 << 24) -> List[List[int]]:
+    # One pass over buf for all literal patterns; returns positions per pattern index.
+    # Decoded chunk by chunk (overlapping by longest-1 bytes) to keep the text copy small.
+    out = [[] for _ in range(count)]
+    size = len(buf)
+    for base in range(0, size, chunk):
+        part = buf[base:base + chunk + longest - 1]
+        for end, (n, ids) in A.iter(str(part.lower() if fold else part, "latin-1")):
+            i = end - n + 1
+            if i >= chunk: continue  # starts in the overlap, reported by the next chunk
+            i += base
+            if whole_word:
+                left_ok = (i == 0) or not is_word_byte(buf[i-1])
+                right_ok = (i+n >= size) or not is_word_byte(buf[i+n])
+                if not (left_ok and right_ok): continue
+            for idx in ids:
+                out[idx].append(i)
+    return out
+
+def build_hyperscan_db(patterns: List[str], fold: bool):
+    # All regexes in one block-mode database, used as a prefilter only: PREFILTER never
+    # misses a match (it may over-report), SINGLEMATCH reports each pattern once
+    flags = hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH | (hyperscan.HS_FLAG_CASELESS if fold else 0)
+    db = hyperscan.Database()
+    db.compile(expressions=[p.encode("utf-8") for p in patterns], ids=list(range(len(patterns))),
+               elements=len(patterns), flags=[flags] * len(patterns))
+    return db
+
+def scan_hyperscan(buf, db, count: int) -> set:
+    # Indices of the patterns that may occur in buf, in one pass for all of them. Positions
+    # still come from each pattern's own finditer, so hits never depend on the other patterns
+    scratch = getattr(_hs_local, "scratch", None)
+    if scratch is None or _hs_local.db is not db:
+        scratch = hyperscan.Scratch(db)
+        _hs_local.scratch, _hs_local.db = scratch, db
+    present = set()
+    def on_match(idx, start, end, flags, ctx):
+        present.add(idx)
+        return len(present) == count  # all patterns seen: stop early
+    try:
+        db.scan(buf, match_event_handler=on_match, scratch=scratch)
+    except hyperscan.ScanTerminated:
+        pass
+    return present
+
+def build_scan_plan(patterns: List[str], opts: Dict[str, Any]) -> Dict[str, Any]:
+    # Everything the Python fallback can prepare once per search instead of per file
+    plan = {"regex": compile_patterns(patterns, opts), "needles": None, "automaton": None, "hyperscan": None}
+    if not opts["use_regex"]:
+        plan["needles"] = [p.encode("utf-8") if opts["case_sensitive"] else p.encode("utf-8").lower() for p in patterns]
+    if len(patterns) > 1 and not opts["use_regex"] and ahocorasick is not None:
+        plan["automaton"] = build_automaton(patterns, not opts["case_sensitive"])
+    if len(patterns) > 1 and opts["use_regex"] and hyperscan is not None:
+        try:
+            plan["hyperscan"] = build_hyperscan_db(patterns, not opts["case_sensitive"])
+        except hyperscan.error as e:  # backrefs, empty matches, ... -> per-pattern engines
+            logger.info("Hyperscan not used: %s", e)
+    return plan
+
+def scan_literal(buf, needle: bytes, fold: bool, whole_word: bool, chunk: int = 1 << 24) -> List[int]:
+    # All start offsets of needle in buf (overlapping), JIT kernel when numba is installed
+    if scan_literal_nb is not None:
+        arr = np.frombuffer(buf, dtype=np.uint8)
+        words = np.frombuffer(buf, dtype=np.uint64, count=len(buf) // 8)
+        try:
+            return scan_literal_nb(arr, words, np.frombuffer(needle, dtype=np.uint8), fold, whole_word).tolist()
+        finally:
+            del arr, words
+    if not needle: return []
+    n, size = len(needle), len(buf)
+    positions = []
+    if fold:
+        # Lower the file in fixed-size chunks (overlapping by n-1 bytes) instead of
+        # making a lowered copy of the whole file; hits starting in the overlap
+        # belong to the next chunk
+        for base in range(0, size, chunk):
+            part = buf[base:base + chunk + n - 1].lower()
+            i = part.find(needle)
+            while 0 <= i < chunk:
+                positions.append(base + i)
+                i = part.find(needle, i + 1)
+    else:
+        i = buf.find(needle)
+        while i >= 0:
+            positions.append(i)
+            i = buf.find(needle, i + 1)
+    if not whole_word: return positions
+    return [i for i in positions
+            if (i == 0 or not is_word_byte(buf[i-1])) and (i+n >= size or not is_word_byte(buf[i+n]))]
+
+# Minimal Python fallback (slower), also returns lines.
+# Works on a read-only mmap, so positions are byte offsets like in the native module.
+def scan_file_py(path: str, patterns: List[str], opts: Dict[str, Any], plan: Dict[str, Any] = None,
+                 size: int = None) -> Dict[str, Any]:
+    d = new_result(path, patterns)
+    try:
+        if size is None: size = os.path.getsize(path)
+        d["file_size"] = size
+        if opts["max_mb"] > 0 and size > int(opts["max_mb"] * 1024 * 1024):
+            d["error"] = "Skipped: file size > limit"
+            return d
+        if size == 0:  # mmap cannot map empty files
+            return d
+        plan = plan or build_scan_plan(patterns, opts)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            d["is_binary"] = mm.find(b"\x00", 0, 8192) >= 0  # sniff the head only, like git/grep
+            multi, present, found = None, None, []
+            if plan["automaton"] is not None:
+                multi = scan_automaton(mm, plan["automaton"], len(patterns), max(map(len, plan["needles"])),
+                                       not opts["case_sensitive"], opts["whole_word"])
+            elif plan["hyperscan"] is not None:
+                present = scan_hyperscan(mm, plan["hyperscan"], len(patterns))
+            for idx, (pat, rx) in enumerate(zip(patterns, plan["regex"])):
+                if multi is not None:
+                    positions = multi[idx]
+                elif present is not None and idx not in present:
+                    positions = []
+                elif rx is not None:
+                    with memoryview(mm) as view:  # buffer type every engine accepts
+                        positions = match_starts(rx, view)
+                else:
+                    positions = scan_literal(mm, plan["needles"][idx], not opts["case_sensitive"], opts["whole_word"])
+                found.append(np.asarray(positions, dtype=np.int64))
+            if any(a.size for a in found):
+                d["pattern_ids"] = np.repeat(np.arange(len(found), dtype=np.int32), [a.size for a in found])
+                d["positions"] = np.concatenate(found)
+                nl = newline_offsets(mm)  # only files with hits pay for the line index
+                d["lines"] = (np.searchsorted(nl, d["positions"], side="right") + 1).astype(np.int32)
+    except Exception as e:
+        d["error"] = str(e)
+    return d
+
+@lru_cache(maxsize=1)
+def _worker_plan(patterns: tuple, opts_items: tuple) -> Dict[str, Any]:
+    # Plans hold compiled objects that cannot be pickled, so each worker process builds its own
+    return build_scan_plan(list(patterns), dict(opts_items))
+
+def scan_files_worker(files: List[Tuple[str, int]], patterns: List[str], opts: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Entry point for ProcessPoolExecutor (module level so it can be pickled)
+    plan = _worker_plan(tuple(patterns), tuple(sorted(opts.items())))
+    return [scan_file_py(p, patterns, opts, plan, size) for p, size in files]
 
 # ----- Worker infra ----------------------------------------------------------
+TASK_CHUNK = 64  # files per FileScanTask: amortizes pool dispatch and cross-thread signals
+TASK_CHUNK_BYTES = 8 * 1024 * 1024  # ... but big files get a task of their own
+
+def chunk_files(files: List[Tuple[str, int]]) -> List[List[Tuple[str, int]]]:
+    # Expects (path, size) sorted largest first: big files are dispatched early, one per
+    # task, and the many small ones fill in the tail in batches
+    chunks, cur, cur_bytes = [], [], 0
+    for f in files:
+        if cur and (len(cur) >= TASK_CHUNK or cur_bytes + f[1] > TASK_CHUNK_BYTES):
+            chunks.append(cur); cur, cur_bytes = [], 0
+        cur.append(f); cur_bytes += f[1]
+    if cur: chunks.append(cur)
+    return chunks
+
 class WorkerSignals(QObject):
-    result = Signal(dict)        # { path, hits:[{pattern, positions, lines}], is_binary, error, file_size }
-    file_done = Signal(str)
-    problem = Signal(str, str)
+    # one queued emit per chunk: results [{ path, patterns, pattern_ids, positions, lines, is_binary, error, file_size }, ...],
+    # problems [(path, err), ...] and the number of files the chunk covered
+    batch = Signal(list, list, int)
     all_done = Signal()
 
 class FileScanTask(QRunnable):
-    def __init__(self, path: str, patterns: List[str], opts: Dict[str, Any], signals: WorkerSignals):
+    def __init__(self, files: List[Tuple[str, int]], patterns: List[str], opts: Dict[str, Any], signals: WorkerSignals,
+                 plan: Dict[str, Any] = None, cancelled: threading.Event = None):
         super().__init__()
-        self.path = path
+        self.files = files
         self.patterns = patterns
+        self.plan = plan
         self.opts = opts
         self.signals = signals
+        self.cancelled = cancelled
 
     @Slot()
     def run(self):
-        try:
-            max_bytes = 0 if self.opts["max_mb"] <= 0 else int(self.opts["max_mb"] * 1024 * 1024)
-            if sx:
-                res = sx.search_in_file(
-                    self.path,
-                    self.patterns,
-                    self.opts["case_sensitive"],
-                    self.opts["use_regex"],
-                    self.opts["whole_word"],
-                    max_bytes
-                )
-            else:
-                res = self._fallback_py(self.path, self.patterns, self.opts)
-            if res.get("error"):
-                self.signals.problem.emit(self.path, str(res["error"]))
-            self.signals.result.emit(res)
-        except Exception as e:
-            logger.error("Task error '%s': %s\n%s", self.path, e, traceback.format_exc())
-            self.signals.problem.emit(self.path, str(e))
-        finally:
-            self.signals.file_done.emit(self.path)
-
-    # Minimal Python fallback (slower), also returns lines
-    def _fallback_py(self, path, patterns, opts):
-        d = {"path": path, "is_binary": False, "error": None, "file_size": 0, "hits": []}
-        try:
-            data = Path(path).read_bytes()
-            d["file_size"] = len(data)
-            if opts["max_mb"] > 0 and len(data) > int(opts["max_mb"] * 1024 * 1024):
-                d["error"] = "Skipped: file size > limit"
-                return d
-            is_bin = b"\x00" in data
-            d["is_binary"] = is_bin
-            text = data.decode("utf-8", errors="ignore")
-            for pat in patterns:
-                positions, lines = [], []
-                if opts["use_regex"]:
-                    flags = 0 if opts["case_sensitive"] else re.IGNORECASE
-                    for m in re.finditer(pat, text, flags):
-                        positions.append(m.start())
-                        lines.append(text.count("\n", 0, m.start()) + 1)
+        max_bytes = 0 if self.opts["max_mb"] <= 0 else int(self.opts["max_mb"] * 1024 * 1024)
+        results, problems = [], []
+        for path, size in self.files:
+            if self.cancelled is not None and self.cancelled.is_set():
+                break  # the batch below still reports all files, so the search completes
+            try:
+                if sx:
+                    res = sx.search_in_file(
+                        path,
+                        self.patterns,
+                        self.opts["case_sensitive"],
+                        self.opts["use_regex"],
+                        self.opts["whole_word"],
+                        max_bytes
+                    )
                 else:
-                    hay = text if opts["case_sensitive"] else text.lower()
-                    needle = pat if opts["case_sensitive"] else pat.lower()
-                    start = 0
-                    while True:
-                        i = hay.find(needle, start)
-                        if i < 0: break
-                        if opts["whole_word"]:
-                            left_ok = (i == 0) or not (text[i-1].isalnum() or text[i-1] == "_")
-                            right_ok = (i+len(pat) >= len(text)) or not (text[i+len(pat)].isalnum() or text[i+len(pat)] == "_")
-                            if not (left_ok and right_ok):
-                                start = i + 1; continue
-                        positions.append(i)
-                        lines.append(text.count("\n", 0, i) + 1)
-                        start = i + 1
-                d["hits"].append({"pattern": pat, "positions": positions, "lines": lines})
-        except Exception as e:
-            d["error"] = str(e)
-        return d
+                    res = scan_file_py(path, self.patterns, self.opts, self.plan, size)
+                if res.get("error"):
+                    problems.append((path, str(res["error"])))
+                results.append(res)
+            except Exception as e:
+                logger.error("Task error '%s': %s\n%s", path, e, traceback.format_exc())
+                problems.append((path, str(e)))
+        self.signals.batch.emit(results, problems, len(self.files))
+
+def emit_future_results(fut, files: List[Tuple[str, int]], signals: WorkerSignals):
+    # done-callback of a process pool future; runs on the executor's thread,
+    # the signals queue everything over to the UI thread
+    if fut.cancelled():
+        signals.batch.emit([], [], len(files))  # still counts towards completion
+        return
+    try:
+        results = fut.result()
+    except Exception as e:
+        logger.error("Worker process error: %s", e)
+        signals.batch.emit([], [(path, str(e)) for path, _ in files], len(files))
+        return
+    problems = [(res["path"], str(res["error"])) for res in results if res.get("error")]
+    signals.batch.emit(results, problems, len(files))
 
 # ----- Tile widget -----------------------------------------------------------
 class TileWidget(QFrame):
@@ -152,18 +535,14 @@ class TileWidget(QFrame):
     def _build(self):
         from PySide6.QtWidgets import QVBoxLayout, QHBoxLayout
         path = Path(self.info["path"])
-        hits = self.info.get("hits", [])
-        total_hits = sum(len(h["positions"]) for h in hits)
+        positions = self.info["positions"]
+        total_hits = int(positions.size)
         is_bin = self.info.get("is_binary", False)
         err = self.info.get("error")
 
         # unique line numbers across all patterns
-        line_set = set()
-        for h in hits:
-            for ln in h.get("lines", []):
-                line_set.add(int(ln))
-        unique_lines = sorted(line_set)
-        lines_preview = ", ".join(str(x) for x in unique_lines[:20])
+        unique_lines = np.unique(self.info["lines"])
+        lines_preview = ", ".join(str(x) for x in unique_lines[:20].tolist())
         more = "" if len(unique_lines) <= 20 else f" … (+{len(unique_lines)-20} more)"
 
         lay = QVBoxLayout(self)
@@ -173,11 +552,9 @@ class TileWidget(QFrame):
         # determine first match once (for the Jump button and preview)
         first_pos = None
         first_pat = None
-        for h in hits:
-            if h["positions"]:
-                first_pos = int(h["positions"][0])
-                first_pat = h["pattern"]
-                break
+        if total_hits:
+            first_pos = int(positions[0])
+            first_pat = self.info["patterns"][int(self.info["pattern_ids"][0])]
 
         # --- TOP BAR -------------------------------------------------------------
         top = QHBoxLayout()
@@ -216,7 +593,7 @@ class TileWidget(QFrame):
         )
         lay.addWidget(info_lbl)
 
-        if unique_lines:
+        if unique_lines.size:
             lay.addWidget(QLabel(f"Lines: {lines_preview}{more}"))
 
         # First match preview (no extra jump button below anymore)
@@ -228,16 +605,9 @@ class TileWidget(QFrame):
                 prev.setPlainText(self._read_hex_preview(path, first_pos))
             else:
                 text = self._read_text_preview(path, first_pos)
-                if first_pat:
-                    try:
-                        flags = 0 if self.options["case_sensitive"] else re.IGNORECASE
-                        rx = re.compile(
-                            re.escape(first_pat) if not self.options["use_regex"] else first_pat,
-                            flags
-                        )
-                        text = rx.sub(lambda m: f"«{m.group(0)}»", text)
-                    except re.error:
-                        pass
+                rx = self.options["_highlight_rx"].get(first_pat)
+                if rx is not None:
+                    text = rx.sub(lambda m: f"«{m.group(0)}»", text)
                 prev.setPlainText(text)
             lay.addWidget(prev)
 
@@ -245,41 +615,71 @@ class TileWidget(QFrame):
             lay.addWidget(QLabel(f"⚠️ Problem: {err}"))
 
 
+    @staticmethod
+    def _read_window(path: Path, pos: int, span: int) -> bytes:
+        # Only the bytes around pos, never the whole file
+        with open(path, "rb") as f:
+            f.seek(max(0, pos - span))
+            return f.read(min(pos, span) + span)
+
     def _read_text_preview(self, path: Path, pos: int, span: int = 120) -> str:
         try:
-            data = path.read_bytes()
-            start = max(0, pos - span); end = min(len(data), pos + span)
-            return data[start:end].decode("utf-8", errors="replace")
+            return self._read_window(path, pos, span).decode("utf-8", errors="replace")
         except Exception as e:
             return f"[Preview error: {e}]"
 
     def _read_hex_preview(self, path: Path, pos: int, span: int = 64) -> str:
         try:
-            data = path.read_bytes()
-            start = max(0, pos - span); end = min(len(data), pos + span)
-            chunk = data[start:end]
+            chunk = self._read_window(path, pos, span)
             return " ".join(f"{b:02X}" for b in chunk)
         except Exception as e:
             return f"[Preview error: {e}]"
 
-    def open_preview(self, path: Path, pos: int, is_bin: bool):
+    def open_preview(self, path: Path, pos: int, is_bin: bool, span: int = 512 * 1024):
         # Use QPlainTextEdit (supports centerCursor())
-        w = QMainWindow(self); w.setWindowTitle(f"Preview – {path.name}")
+        # parented to the main window: the tile itself is dropped when scrolled out of view
+        w = QMainWindow(self.window()); w.setWindowTitle(f"Preview – {path.name}")
         txt = QPlainTextEdit(); txt.setReadOnly(True)
         if is_bin:
             txt.setPlainText(self._read_hex_preview(path, pos))
         else:
+            # Large files: show a window of +-span bytes around the hit instead of loading everything
             try:
-                data = path.read_text(encoding="utf-8", errors="replace")
-            except Exception:
-                data = path.read_bytes().decode("latin-1", errors="replace")
+                chunk = self._read_window(path, pos, span)
+            except Exception as e:
+                chunk = f"[Preview error: {e}]".encode()
+            head = min(pos, span)
+            if head < pos or len(chunk) - head >= span:
+                w.setWindowTitle(f"Preview – {path.name} (excerpt around offset {pos})")
+            data = chunk.decode("utf-8", errors="replace")
             txt.setPlainText(data)
             cur = txt.textCursor()
-            cur.setPosition(min(pos, len(data)))
+            cur.setPosition(min(len(chunk[:head].decode("utf-8", errors="replace")), len(data)))
             txt.setTextCursor(cur)
             txt.centerCursor()         # <-- works with QPlainTextEdit
         w.setCentralWidget(txt); w.resize(900, 600); w.show()
 
+TILE_SIZE = QSize(800, 220)
+
+class TileDelegate(QStyledItemDelegate):
+    # Result rows are plain items holding the info dict (Qt.UserRole); the TileWidget
+    # is only built as a persistent editor while its row is on screen
+    def __init__(self, window: "MainWindow"):
+        super().__init__(window.list)
+        self._window = window
+
+    def createEditor(self, parent, option, index):
+        return TileWidget(index.data(Qt.UserRole), self._window.current_options, parent)
+
+    def updateEditorGeometry(self, editor, option, index):
+        editor.setGeometry(option.rect)
+
+    def sizeHint(self, option, index):
+        return TILE_SIZE
+
+    def paint(self, painter, option, index):
+        pass  # the tile widget draws the row
+
 # ----- Main window -----------------------------------------------------------
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -288,6 +688,9 @@ class MainWindow(QMainWindow):
         self.resize(1200, 800)
         self.setAcceptDrops(True)
         self.pool = QThreadPool.globalInstance()
+        self._proc_pool: ProcessPoolExecutor = None  # only used without the native module
+        self._proc_workers = 0
+        self._futures: list = []
 
         self._build_ui()
         self._connect()
@@ -298,17 +701,18 @@ class MainWindow(QMainWindow):
         self.status.addPermanentWidget(self.status_label)
         self.status.addPermanentWidget(self.pbar, 1)
 
-        self.cancelled = False
+        self.cancelled = threading.Event()  # read by FileScanTasks on the pool threads
         self.files_total = 0
         self.files_done = 0
+        self._outstanding = 0  # files not yet reported by a batch; all_done fires at zero
 
         # Responsive UI: batch/queue rendering
-        self._pending_results: List[dict] = []
-        self._pending_problems: List[tuple] = []
+        self._pending_results: deque = deque()
+        self._pending_problems: deque = deque()
         self._flush_timer = QTimer(self); self._flush_timer.setInterval(30)
         self._flush_timer.timeout.connect(self._flush_queues)
         self._flush_timer.start()
-        self._batch_size = 12
+        self._batch_size = 200  # rows are cheap items now, tiles are built on demand
 
         self.current_options: Dict[str, Any] = {}
         self.current_patterns: List[str] = []
@@ -354,6 +758,13 @@ class MainWindow(QMainWindow):
         # Results + Errors area with splitter so errors take minimal space
         self.splitter = QSplitter(Qt.Vertical)
         self.list = QListWidget(); self.list.setSpacing(8)
+        self.list.setUniformItemSizes(True)
+        self.list.setLayoutMode(QListView.Batched)
+        self.list.setItemDelegate(TileDelegate(self))
+        self._open_rows: set = set()
+        self._sync_pending = False
+        self.list.verticalScrollBar().valueChanged.connect(self._schedule_sync)
+        self.list.verticalScrollBar().rangeChanged.connect(self._schedule_sync)
         # --- Collapsible errors section ---
         err_container = QWidget(); err_layout = QVBoxLayout(err_container); err_layout.setContentsMargins(0,0,0,0); err_layout.setSpacing(4)
         self.err_toggle = QPushButton("")  # text set later
@@ -407,16 +818,33 @@ class MainWindow(QMainWindow):
         lines = [ln.strip() for ln in self.query_edit.toPlainText().splitlines()]
         return [ln for ln in lines if ln]
 
-    def _enum_files(self, root_path: Path, include_hidden: bool) -> List[Path]:
+    @staticmethod
+    def _file_size(p: Path) -> int:
+        try:
+            return p.stat().st_size
+        except OSError:
+            return 0  # the scan reports the actual error
+
+    def _enum_files(self, root_path: Path, include_hidden: bool) -> List[Tuple[Path, int]]:
+        # (path, size) pairs: stat once here, reused for sorting, name matches and the scan
         files = []
-        if root_path.is_file(): return [root_path]
-        for dirpath, dirnames, filenames in os.walk(root_path):
-            dpath = Path(dirpath)
-            if not include_hidden and is_hidden(dpath): continue
-            for fn in filenames:
-                p = dpath / fn
-                if not include_hidden and is_hidden(p): continue
-                files.append(p)
+        if root_path.is_file(): return [(root_path, self._file_size(root_path))]
+        stack = [str(root_path)]
+        while stack:
+            try:
+                it = os.scandir(stack.pop())
+            except OSError:
+                continue  # unreadable folder, same as os.walk
+            with it:
+                for entry in it:
+                    try:
+                        if not include_hidden and is_hidden_entry(entry): continue
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            files.append((Path(entry.path), entry.stat().st_size))
+                    except OSError:
+                        continue
         return files
 
     def on_start(self):
@@ -430,11 +858,13 @@ class MainWindow(QMainWindow):
             return
 
         self.list.clear()
+        self._open_rows = set()
         self.problems.clear()
         self._pending_results.clear()
         self._pending_problems.clear()
-        self.cancelled = False
+        self.cancelled = threading.Event()
         self.files_done = 0
+        self._outstanding = 0
         self.error_count = 0
         self._update_error_toggle()
 
@@ -446,117 +876,206 @@ class MainWindow(QMainWindow):
             "include_hidden": self.chk_hidden.isChecked(),
             "max_mb": self.spin_max_mb.value()
         }
-        self.current_options = options
+        # Shared by all tiles of this search instead of compiling per tile; this also
+        # validates the patterns before anything is dispatched (native path included)
+        flags = 0 if options["case_sensitive"] else re.IGNORECASE
+        try:
+            highlight_rx = {pat: compile_rx(pat if options["use_regex"] else re.escape(pat), flags)
+                            for pat in patterns}
+            if sx is None:
+                compile_patterns(patterns, options)  # the fallback's bytes regexes; cached for the plan
+        except RX_ERRORS as e:
+            QMessageBox.warning(self, "Error", f"Invalid regex: {e}")
+            return
+        self.current_options = dict(options, _highlight_rx=highlight_rx)
         self.current_patterns = patterns
 
         files = self._enum_files(base, include_hidden=options["include_hidden"])
+        files.sort(key=lambda f: f[1], reverse=True)  # largest first: better load balancing
         self.files_total = len(files)
+        self._outstanding = self.files_total
         self.pbar.setMaximum(max(1, self.files_total)); self.pbar.setValue(0)
         self.status_label.setText(f"{self.files_done}/{self.files_total} files …")
         self.pool.setMaxThreadCount(self.spin_threads.value())
 
         self.signals = WorkerSignals()
-        self.signals.result.connect(self._enqueue_result)
-        self.signals.file_done.connect(self.on_file_done)
-        self.signals.problem.connect(self._enqueue_problem)
+        self.signals.batch.connect(self._enqueue_batch)
         self.signals.all_done.connect(self.on_all_done)
 
         # quick name matches
         if options["name_match"]:
-            for p in files:
+            matchers = self._name_matchers(patterns, options)
+            for p, size in files:
                 name = p.name
-                if self._name_matches(name, patterns, options):
-                    fake = {
-                        "path": str(p),
-                        "is_binary": False,
-                        "error": None,
-                        "file_size": p.stat().st_size if p.exists() else 0,
-                        "hits": [{"pattern": "(name)", "positions": [0], "lines": [1]}]
-                    }
+                if self._name_matches(name, matchers, options):
+                    fake = new_result(str(p), ["(name)"])
+                    fake["file_size"] = size
+                    fake["pattern_ids"] = np.zeros(1, dtype=np.int32)
+                    fake["positions"] = np.zeros(1, dtype=np.int64)
+                    fake["lines"] = np.ones(1, dtype=np.int32)
                     self._enqueue_result(fake)
 
-        for p in files:
-            if self.cancelled: break
-            t = FileScanTask(str(p), patterns, options, self.signals)
-            self.pool.start(t)
-
-        def check_done():
-            if self.pool.activeThreadCount() == 0:
-                self.signals.all_done.emit()
-            else:
-                QTimer.singleShot(300, check_done)
-        QTimer.singleShot(300, check_done)
+        chunks = chunk_files([(str(p), size) for p, size in files])
+        self._futures = []
+        if sx is None and len(chunks) > 1:
+            # The Python fallback holds the GIL, so spread it over processes instead of threads
+            # (each worker builds its own scan plan)
+            proc_pool = self._get_proc_pool(self.spin_threads.value())
+            for c in chunks:
+                try:
+                    fut = proc_pool.submit(scan_files_worker, c, patterns, options)
+                except BrokenProcessPool:
+                    # a worker died in an earlier search (native crash, OOM kill); the
+                    # executor never recovers from that, so replace it
+                    proc_pool = self._get_proc_pool(self.spin_threads.value(), rebuild=True)
+                    fut = proc_pool.submit(scan_files_worker, c, patterns, options)
+                fut.add_done_callback(lambda f, c=c, s=self.signals: emit_future_results(f, c, s))
+                self._futures.append(fut)
+        else:
+            plan = build_scan_plan(patterns, options) if sx is None else None
+            for c in chunks:
+                t = FileScanTask(c, patterns, options, self.signals, plan, self.cancelled)
+                self.pool.start(t)
 
         self.status_label.setText("Searching …")
         self.btn_start.setEnabled(False)
+        if self._outstanding == 0:
+            self.signals.all_done.emit()
 
-    def _name_matches(self, name: str, patterns: List[str], options: Dict[str, Any]) -> bool:
-        if not patterns: return False
-        hay = name if options["case_sensitive"] else name.lower()
+    def _name_matchers(self, patterns: List[str], options: Dict[str, Any]) -> List[Any]:
+        # Built once per search: compiled regex, or the plain needle for substring mode
+        flags = 0 if options["case_sensitive"] else re.IGNORECASE
+        matchers = []
         for pat in patterns:
-            if options["use_regex"]:
-                flags = 0 if options["case_sensitive"] else re.IGNORECASE
-                try:
-                    if re.search(pat, name, flags): return True
-                except re.error:
-                    continue
-            else:
-                needle = pat if options["case_sensitive"] else pat.lower()
-                if options["whole_word"]:
-                    if re.search(rf"(?<!\w){re.escape(needle)}(?!\w)", hay): return True
+            needle = pat if options["case_sensitive"] else pat.lower()
+            try:
+                if options["use_regex"]:
+                    matchers.append(compile_rx(pat, flags))
+                elif options["whole_word"]:
+                    matchers.append(compile_rx(rf"(?<!\w){re.escape(needle)}(?!\w)"))
                 else:
-                    if needle in hay: return True
+                    matchers.append(needle)
+            except RX_ERRORS:
+                continue
+        return matchers
+
+    def _name_matches(self, name: str, matchers: List[Any], options: Dict[str, Any]) -> bool:
+        hay = name if options["case_sensitive"] or options["use_regex"] else name.lower()
+        for m in matchers:
+            if isinstance(m, str):
+                if m in hay: return True
+            elif m.search(hay): return True
         return False
 
+    def _get_proc_pool(self, workers: int, rebuild: bool = False) -> ProcessPoolExecutor:
+        if rebuild or self._proc_pool is None or self._proc_workers != workers:
+            if self._proc_pool is not None:
+                self._proc_pool.shutdown(wait=False, cancel_futures=True)
+            # spawn: never fork a process that runs Qt threads
+            self._proc_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            self._proc_workers = workers
+        return self._proc_pool
+
     def on_cancel(self):
-        self.cancelled = True
+        self.cancelled.set()  # queued thread tasks skip their files
+        for f in self._futures:
+            f.cancel()  # only drops chunks that have not started yet
         self.status_label.setText("Cancel requested (running files will finish).")
 
-    def on_file_done(self, path: str):
-        self.files_done += 1
-        self.pbar.setValue(self.files_done)
-        if self.files_done % 10 == 0 or self.files_done == self.files_total:
-            self.status_label.setText(f"{self.files_done}/{self.files_total} files …")
-
     # ---- Queues + batch flush keeps the UI responsive ----
-    @Slot(dict)
     def _enqueue_result(self, d: dict):
         self._pending_results.append(d)
 
-    @Slot(str, str)
-    def _enqueue_problem(self, path: str, err: str):
-        self._pending_problems.append((path, err))
-        self.error_count += 1
-        self._update_error_toggle()
-        logger.warning("Problem %s: %s", path, err)
+    @Slot(list, list, int)
+    def _enqueue_batch(self, results: list, problems: list, n_files: int):
+        if not self.cancelled.is_set():
+            self._pending_results.extend(results)
+        if problems:
+            self._pending_problems.extend(problems)
+            self.error_count += len(problems)
+            self._update_error_toggle()
+            for path, err in problems:
+                logger.warning("Problem %s: %s", path, err)
+        self.files_done += n_files
+        self.pbar.setValue(self.files_done)
+        self.status_label.setText(f"{self.files_done}/{self.files_total} files …")
+        self._outstanding -= n_files
+        if self._outstanding == 0:
+            self.signals.all_done.emit()
 
     def _flush_queues(self):
         # Render results in small batches
         count = 0
         while self._pending_results and count < self._batch_size:
-            info = self._pending_results.pop(0)
+            info = self._pending_results.popleft()
             self._add_result_tile(info, self.current_options)
             count += 1
+        if count: self._schedule_sync()
         # Problems can be flushed more aggressively
         pcount = 0
         while self._pending_problems and pcount < 50:
-            path, err = self._pending_problems.pop(0)
+            path, err = self._pending_problems.popleft()
             it = QListWidgetItem(f"{path} — {err}")
             self.problems.addItem(it)
             pcount += 1
 
     def _add_result_tile(self, info: Dict[str, Any], options: Dict[str, Any]):
-        hits_count = sum(len(h["positions"]) for h in info.get("hits", []))
-        if hits_count == 0 and not info.get("error"): return
-        w = TileWidget(info, options, self.list)
-        it = QListWidgetItem(self.list); it.setSizeHint(QSize(800, 220))
-        self.list.setItemWidget(it, w)
+        if info["positions"].size == 0 and not info.get("error"): return
+        # fill the item before inserting it: the insert can already trigger a tile sync
+        it = QListWidgetItem(); it.setSizeHint(TILE_SIZE)
+        it.setData(Qt.UserRole, info)
+        self.list.addItem(it)
+
+    def _row_near(self, y: int, step: int) -> int:
+        # indexAt() misses in the spacing between tiles, so probe a few pixels further
+        x = self.list.spacing() + 10
+        for k in range(0, 4 * self.list.spacing() + 2, 2):
+            idx = self.list.indexAt(QPoint(x, y + step * k))
+            if idx.isValid(): return idx.row()
+        return -1
+
+    def _schedule_sync(self, *_):
+        # Scroll/range signals fire in the middle of inserts and layouts; sync once the
+        # event loop is back, and only once per burst
+        if not self._sync_pending:
+            self._sync_pending = True
+            QTimer.singleShot(0, self._sync_tiles)
+
+    def _sync_tiles(self):
+        # Build TileWidgets for the rows on screen (plus one on each side), drop the others
+        self._sync_pending = False
+        n = self.list.count()
+        want = set()
+        vp = self.list.viewport().rect()
+        first = self._row_near(vp.top(), 1) if n else -1
+        if first >= 0:  # nothing laid out under the viewport yet: a later range change resyncs
+            last = self._row_near(vp.bottom(), -1)
+            if last < 0:
+                # rows further down are not laid out yet (Batched layout) or the list ends
+                # above the bottom edge: estimate from the row pitch, never take the whole list
+                pitch = self.list.visualItemRect(self.list.item(first)).height() + self.list.spacing()
+                last = first + vp.height() // max(1, pitch) + 1
+            want = set(range(max(0, first - 1), min(n, last + 2)))
+        for row in self._open_rows - want:
+            it = self.list.item(row)
+            if it is not None: self.list.closePersistentEditor(it)
+        for row in want - self._open_rows:
+            it = self.list.item(row)
+            if it is None or it.data(Qt.UserRole) is None:
+                continue
+            self.list.openPersistentEditor(it)
+        self._open_rows = {r for r in want if self.list.isPersistentEditorOpen(self.list.item(r))}
+
+    def closeEvent(self, e):
+        if self._proc_pool is not None:
+            self._proc_pool.shutdown(wait=False, cancel_futures=True)
+        super().closeEvent(e)
 
     def on_all_done(self):
         # flush remaining queued items
         self._flush_queues()
         self.btn_start.setEnabled(True)
-        self.status_label.setText("Done.")
+        self.status_label.setText("Cancelled." if self.cancelled.is_set() else "Done.")
         logger.info("Search finished: %d/%d files", self.files_done, self.files_total)
 
 # ----- Entry point -----------------------------------------------------------
@@ -574,4 +1093,5 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # scan worker processes in a frozen .exe
     main()
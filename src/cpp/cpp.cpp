@@ -1,5 +1,6 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <pybind11/numpy.h>
 #include <fstream>
 #include <string>
 #include <vector>
@@ -93,6 +94,11 @@ static std::vector<uint64_t> positions_to_lines(const std::vector<uint64_t>& pos
     return out;
 }
 
+template <typename T>
+static py::array_t<T> to_array(const std::vector<T>& v) {
+    return py::array_t<T>(static_cast<py::ssize_t>(v.size()), v.data());
+}
+
 py::dict search_in_file(const std::string& path,
                         const std::vector<std::string>& patterns,
                         bool case_sensitive,
@@ -104,6 +110,11 @@ py::dict search_in_file(const std::string& path,
     result["error"] = py::none();
     result["is_binary"] = false;
     result["file_size"] = py::int_(0);
+    // Hits are column-wise (SoA): hit k is patterns[pattern_ids[k]] at positions[k] on lines[k]
+    result["patterns"] = patterns;
+    result["pattern_ids"] = to_array(std::vector<int32_t>{});
+    result["positions"] = to_array(std::vector<int64_t>{});
+    result["lines"] = to_array(std::vector<int32_t>{});
 
     try {
         fs::path p(path);
@@ -143,24 +154,26 @@ py::dict search_in_file(const std::string& path,
         bool is_bin = is_binary_sample(data);
         auto nl_index = build_newline_index(data);
 
+        // Matching needs no Python objects anymore, so it also runs without the GIL
+        std::vector<int32_t> ids, all_lines;
+        std::vector<int64_t> all_pos;
+        for (size_t k = 0; k < patterns.size(); ++k) {
+            std::vector<uint64_t> pos = use_regex
+                ? find_all_regex(data, patterns[k], case_sensitive)
+                : find_all_substrings(data, patterns[k], case_sensitive, whole_word);
+            std::vector<uint64_t> lines = positions_to_lines(pos, nl_index);
+            ids.insert(ids.end(), pos.size(), static_cast<int32_t>(k));
+            all_pos.insert(all_pos.end(), pos.begin(), pos.end());
+            for (auto ln : lines) all_lines.push_back(static_cast<int32_t>(ln));
+        }
+
         // Acquire GIL to build Python objects
         py::gil_scoped_acquire acq;
 
         result["is_binary"] = is_bin;
-        py::list allhits;
-        for (const auto& pat : patterns) {
-            std::vector<uint64_t> pos = use_regex
-                ? find_all_regex(data, pat, case_sensitive)
-                : find_all_substrings(data, pat, case_sensitive, whole_word);
-            std::vector<uint64_t> lines = positions_to_lines(pos, nl_index);
-
-            py::dict entry;
-            entry["pattern"] = pat;
-            entry["positions"] = pos;
-            entry["lines"] = lines;
-            allhits.append(entry);
-        }
-        result["hits"] = allhits;
+        result["pattern_ids"] = to_array(ids);
+        result["positions"] = to_array(all_pos);
+        result["lines"] = to_array(all_lines);
     } catch (const std::exception& ex) {
         result["error"] = std::string("Exception: ") + ex.what();
     } catch (...) {
@@ -171,6 +184,8 @@ py::dict search_in_file(const std::string& path,
 
 PYBIND11_MODULE(searchex_native, m) {
     m.doc() = "C++ search (pybind11) for searchex";
+    // Bumped whenever the dict returned by search_in_file changes shape; app.py checks it
+    m.attr("result_layout") = 2;
     m.def("search_in_file", &search_in_file,
           py::arg("path"),
           py::arg("patterns"),
@@ -180,6 +195,7 @@ PYBIND11_MODULE(searchex_native, m) {
           py::arg("max_bytes") = 0ULL,
           R"pbdoc(
               Search a file for multiple patterns.
-              Returns: dict(path, is_binary, file_size, error, hits=[{pattern, positions, lines}])
+              Returns: dict(path, is_binary, file_size, error, patterns,
+                            pattern_ids=int32[], positions=int64[], lines=int32[])
           )pbdoc");
 }
@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+pytest.importorskip("ahocorasick")
+
+import app
+
+
+def reference(data, patterns, fold, whole_word):
+    # every (overlapping) occurrence of each pattern, found with bytes.find
+    hay = data.lower() if fold else data
+    out = []
+    for pat in patterns:
+        needle = pat.encode("utf-8")
+        if fold: needle = needle.lower()
+        hits, i = [], hay.find(needle)
+        while i != -1:
+            end = i + len(needle)
+            if not whole_word or ((i == 0 or not app.is_word_byte(data[i-1])) and
+                                  (end >= len(data) or not app.is_word_byte(data[end]))):
+                hits.append(i)
+            i = hay.find(needle, i + 1)
+        out.append(hits)
+    return out
+
+
+def scan(data, patterns, fold=False, whole_word=False, chunk=1 << 24):
+    A = app.build_automaton(patterns, fold)
+    longest = max(len(p.encode("utf-8")) for p in patterns)
+    return app.scan_automaton(data, A, len(patterns), longest, fold, whole_word, chunk=chunk)
+
+
+@pytest.mark.parametrize("offset", range(-6, 2))
+def test_hit_straddling_chunk_edge(offset):
+    # "needle" placed so that it starts before, on and just after the 16-byte boundary
+    data = bytearray(b"." * 40)
+    data[16 + offset:16 + offset + 6] = b"needle"
+    data = bytes(data)
+    assert scan(data, ["needle", "ne"], chunk=16) == reference(data, ["needle", "ne"], False, False)
+    assert scan(data, ["needle"], chunk=16) == [[16 + offset]]
+
+
+def test_overlapping_hits_across_edges_reported_once():
+    data = b"a" * 50
+    assert scan(data, ["aaa", "a"], chunk=7) == [list(range(48)), list(range(50))]
+
+
+def test_file_smaller_than_one_chunk():
+    data = b"foo bar foo"
+    assert scan(data, ["foo", "bar"], chunk=1 << 10) == [[0, 8], [4]]
+    assert scan(b"", ["foo"], chunk=1 << 10) == [[]]
+    assert scan(b"fo", ["foo"], chunk=1 << 10) == [[]]
+
+
+def test_whole_word_uses_bytes_outside_the_chunk():
+    # the word boundary check looks at the neighbours in the whole buffer, not the chunk
+    data = b"xxxxxxxfoo foox foo"
+    assert scan(data, ["foo"], whole_word=True, chunk=8) == [[16]]
+    assert scan(data, ["foo"], whole_word=True, chunk=10) == [[16]]
+
+
+def test_chunked_scan_matches_reference():
+    rnd = random.Random(5)
+    for _ in range(500):
+        patterns = ["".join(rnd.choice("abAB é") for _ in range(rnd.randint(1, 5))) for _ in range(rnd.randint(1, 4))]
+        data = "".join(rnd.choice("abAB é\n") for _ in range(rnd.randint(0, 80))).encode("utf-8")
+        fold, whole_word = rnd.random() < 0.5, rnd.random() < 0.3
+        chunk = rnd.randint(1, 20)
+        assert scan(data, patterns, fold, whole_word, chunk) == reference(data, patterns, fold, whole_word), \
+            (patterns, data, fold, whole_word, chunk)
+
+
+def test_chunk_files_limits():
+    MB = 1024 * 1024
+    small = [(f"s{i}", 10) for i in range(130)]
+    assert [len(c) for c in app.chunk_files(small)] == [64, 64, 2]
+    # byte budget: a file that would push a batch past it starts a new one
+    files = [("big", 20 * MB), ("m1", 5 * MB), ("m2", 3 * MB), ("m3", 1 * MB), ("s", 10)]
+    assert app.chunk_files(files) == [[("big", 20 * MB)], [("m1", 5 * MB), ("m2", 3 * MB)], [("m3", 1 * MB), ("s", 10)]]
+    assert app.chunk_files([]) == []
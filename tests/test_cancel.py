@@ -0,0 +1,51 @@
+import os
+import threading
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+import app
+
+OPTS = {"case_sensitive": True, "use_regex": False, "whole_word": False, "max_mb": 0}
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def run_task(files, cancelled):
+    signals = app.WorkerSignals()
+    batches = []
+    signals.batch.connect(lambda r, p, n: batches.append((r, p, n)))
+    app.FileScanTask(files, ["foo"], OPTS, signals, app.build_scan_plan(["foo"], OPTS), cancelled).run()
+    return batches
+
+
+def test_task_scans_until_cancelled(qapp, tmp_path):
+    files = []
+    for i in range(3):
+        f = tmp_path / f"{i}.txt"
+        f.write_bytes(b"foo\n")
+        files.append((str(f), f.stat().st_size))
+    [(results, problems, n)] = run_task(files, threading.Event())
+    assert len(results) == 3 and not problems and n == 3
+
+    cancelled = threading.Event()
+    cancelled.set()
+    # skipped files are still reported, so the search's file counter reaches zero
+    [(results, problems, n)] = run_task(files, cancelled)
+    assert results == [] and n == 3
+
+
+def test_batches_after_cancel_add_no_tiles(qapp, tmp_path):
+    w = app.MainWindow()
+    w.signals = app.WorkerSignals()
+    w.signals.all_done.connect(w.on_all_done)
+    w.files_total = w._outstanding = 2
+    w.on_cancel()
+    w._enqueue_batch([app.new_result(str(tmp_path / "x"), ["foo"])], [], 2)
+    assert not w._pending_results
+    assert w.status_label.text() == "Cancelled."
@@ -0,0 +1,49 @@
+import random
+import re
+
+import pytest
+
+pytest.importorskip("hyperscan")
+
+import app
+
+OPTS = {"use_regex": True, "case_sensitive": True, "whole_word": False, "max_mb": 0}
+ATOMS = ["a", "b", "ab", "[ab]", "a+", "b?a", "(ab|b)", ".", "x*a"]
+
+
+def hits_of(path, patterns, opts, plan):
+    d = app.scan_file_py(str(path), patterns, opts, plan)
+    assert d["error"] is None
+    return [[int(p) for p, i in zip(d["positions"], d["pattern_ids"]) if i == k] for k in range(len(patterns))]
+
+
+@pytest.mark.parametrize("patterns, data, expected", [
+    (["call .*?;", "ba[rz]"], b"call foo(1); call foo(2);", [0, 13]),
+    (["x|xyz|y", "q"], b"xyz", [0, 1]),
+])
+def test_hits_do_not_depend_on_other_patterns(tmp_path, patterns, data, expected):
+    f = tmp_path / "f.bin"
+    f.write_bytes(data)
+    plan = app.build_scan_plan(patterns, OPTS)
+    assert plan["hyperscan"] is not None
+    assert hits_of(f, patterns, OPTS, plan)[0] == expected
+    assert hits_of(f, patterns[:1], OPTS, None)[0] == expected
+
+
+def test_prefilter_matches_finditer(tmp_path):
+    rnd = random.Random(3)
+    f = tmp_path / "f.bin"
+    used = 0
+    for _ in range(2000):
+        patterns = ["".join(rnd.choice(ATOMS) for _ in range(rnd.randint(1, 3))) for _ in range(rnd.randint(2, 4))]
+        data = bytes(rnd.choice(b"abx\n") for _ in range(rnd.randint(1, 60)))
+        opts = dict(OPTS, case_sensitive=rnd.random() < 0.5)
+        f.write_bytes(data)
+        plan = app.build_scan_plan(patterns, opts)
+        used += plan["hyperscan"] is not None
+        prefiltered = hits_of(f, patterns, opts, plan)
+        unfiltered = hits_of(f, patterns, opts, dict(plan, hyperscan=None))
+        flags = 0 if opts["case_sensitive"] else re.IGNORECASE
+        reference = [[m.start() for m in re.finditer(p.encode(), data, flags)] for p in patterns]
+        assert prefiltered == unfiltered == reference, (patterns, data, opts)
+    assert used > 1000  # most sets must actually go through Hyperscan
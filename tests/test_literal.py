@@ -0,0 +1,101 @@
+import random
+import re
+
+import numpy as np
+import pytest
+
+import app
+
+ALPHABET = b"aAbB_ 1\n\x00\xff"
+
+
+def reference(buf, needle, fold, whole_word):
+    # Overlapping occurrences via a lookahead; word bytes are ASCII [A-Za-z0-9_] like is_word_byte
+    pat = re.escape(needle)
+    if whole_word:
+        pat = rb"(?<![A-Za-z0-9_])" + pat + rb"(?![A-Za-z0-9_])"
+    return [m.start() for m in re.finditer(rb"(?=" + pat + rb")", buf, re.IGNORECASE if fold else 0)]
+
+
+def find_all(buf, needle):
+    out, i = [], buf.find(needle)
+    while i >= 0:
+        out.append(i)
+        i = buf.find(needle, i + 1)
+    return out
+
+
+def cases(n, seed):
+    rnd = random.Random(seed)
+    for _ in range(n):
+        buf = bytes(rnd.choice(ALPHABET) for _ in range(rnd.randint(0, 120)))
+        m = rnd.randint(1, 20)  # both sides of the Horspool / SWAR split at 8 bytes
+        if buf and rnd.random() < 0.6:
+            st = rnd.randrange(len(buf))
+            needle = buf[st:st + m]
+        else:
+            needle = bytes(rnd.choice(ALPHABET) for _ in range(m))
+        yield buf, needle, rnd.random() < 0.5, rnd.random() < 0.5
+
+
+@pytest.fixture(params=["python", "numba"])
+def engine(request, monkeypatch):
+    if request.param == "numba":
+        if app.scan_literal_nb is None:
+            pytest.skip("numba not installed")
+    else:
+        monkeypatch.setattr(app, "scan_literal_nb", None)
+    return request.param
+
+
+def scan(buf, needle, fold, whole_word, **kw):
+    return app.scan_literal(buf, needle.lower() if fold else needle, fold, whole_word, **kw)
+
+
+def test_matches_find(engine):
+    for buf, needle, _, _ in cases(500, 1):
+        assert scan(buf, needle, False, False) == find_all(buf, needle), (buf, needle)
+
+
+def test_matches_reference(engine):
+    for buf, needle, fold, whole_word in cases(2000, 2):
+        assert scan(buf, needle, fold, whole_word) == reference(buf, needle, fold, whole_word), \
+            (buf, needle, fold, whole_word)
+
+
+@pytest.mark.parametrize("needle", [b"ab", b"abcdefgh", b"abcdefghi", b"ABCDEFGHIJKLMNOP"])
+@pytest.mark.parametrize("fold", [False, True])
+def test_buffer_edges(engine, needle, fold):
+    for pad in range(0, 18):  # moves the hits across the uint64 word / tail boundary
+        buf = needle + b"-" * pad + needle
+        hits = scan(buf, needle, fold, True)
+        assert hits == [0, len(needle) + pad] if pad else hits == []
+        assert scan(buf.swapcase(), needle, fold, False) == (reference(buf.swapcase(), needle, True, False) if fold else [])
+    assert scan(needle, needle, fold, False) == [0]
+    assert scan(needle[:-1], needle, fold, False) == []
+    assert scan(b"", needle, fold, False) == []
+
+
+def test_python_fold_chunks():
+    # the lowered chunks overlap by len(needle) - 1 bytes; hits there belong to one chunk only
+    rnd = random.Random(3)
+    for _ in range(300):
+        buf = bytes(rnd.choice(b"aAb") for _ in range(rnd.randint(0, 60)))
+        needle = bytes(rnd.choice(b"ab") for _ in range(rnd.randint(1, 6)))
+        for chunk in (1, 3, 7, 64):
+            assert app.scan_literal(buf, needle, True, False, chunk=chunk) == reference(buf, needle, True, False)
+
+
+@pytest.mark.skipif(app.scan_literal_nb is None, reason="numba not installed")
+def test_numba_kernels_directly():
+    for buf, needle, fold, whole_word in cases(500, 4):
+        nd = needle.lower() if fold else needle
+        if len(nd) > len(buf):
+            continue
+        hay = np.frombuffer(buf, dtype=np.uint8)
+        words = np.frombuffer(buf, dtype=np.uint64, count=len(buf) // 8)
+        arr = np.frombuffer(nd, dtype=np.uint8)
+        expected = reference(buf, needle, fold, whole_word)
+        assert app._horspool_nb(hay, arr, fold, whole_word).tolist() == expected
+        for r in range(len(nd)):  # the SWAR filter byte must not change the result
+            assert app._swar_nb(hay, words, arr, r, fold, whole_word).tolist() == expected
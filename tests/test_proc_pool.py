@@ -0,0 +1,53 @@
+import os
+import signal
+import sys
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+import app
+
+pytestmark = [
+    pytest.mark.skipif(app.sx is not None, reason="the process pool only runs the Python fallback"),
+    pytest.mark.skipif(sys.platform == "win32", reason="kills workers with SIGKILL"),
+]
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_search_recovers_from_dead_worker(qapp, tmp_path):
+    for i in range(app.TASK_CHUNK + 10):  # two chunks -> process pool
+        (tmp_path / f"{i}.txt").write_bytes(b"foo\n")
+    w = app.MainWindow()
+    w.spin_threads.setValue(2)
+    pool = w._get_proc_pool(2)
+    pool.submit(int).result()
+    for pid in list(pool._processes):
+        os.kill(pid, signal.SIGKILL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:  # wait until the executor notices
+        try:
+            pool.submit(int).result()
+        except BrokenProcessPool:
+            break
+        time.sleep(0.05)
+
+    w.path_edit.setText(str(tmp_path))
+    w.query_edit.setPlainText("foo")
+    w.on_start()
+    deadline = time.monotonic() + 60
+    while w._outstanding and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    w._flush_queues()
+    assert w._proc_pool is not pool
+    assert w.list.count() == app.TASK_CHUNK + 10
+    assert w.problems.count() == 0
+    w.close()
@@ -0,0 +1,20 @@
+import re
+
+import pytest
+
+import app
+
+
+@pytest.mark.parametrize("pat, data, expected", [
+    (rb"$", b"abcde", [5]),
+    (rb"\b", b"ab cd", [0, 2, 3, 5]),
+    (rb"x*", b"abxd", [0, 1, 2, 3, 4]),
+    (rb"o", b"foo boo", [1, 2, 5, 6]),
+])
+def test_match_starts_every_engine(pat, data, expected):
+    assert app.match_starts(re.compile(pat), data) == expected
+    assert app.match_starts(app.compile_rx(pat), data) == expected
+    re2 = pytest.importorskip("re2")
+    opts = re2.Options(); opts.log_errors = False
+    assert app.match_starts(re2.compile(pat, opts), data) == expected
+
@@ -0,0 +1,94 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PySide6.QtWidgets")
+
+import app
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def fake_result(path):
+    d = app.new_result(str(path), ["foo"])
+    d["file_size"] = path.stat().st_size
+    d["pattern_ids"] = np.zeros(1, dtype=np.int32)
+    d["positions"] = np.zeros(1, dtype=np.int64)
+    d["lines"] = np.ones(1, dtype=np.int32)
+    return d
+
+
+def settle(qapp, ms=200):
+    # let delayed layouts and zero-timeout timers run, like the real event loop would
+    deadline = time.monotonic() + ms / 1000
+    while time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+def open_rows(w):
+    model = w.list.model()
+    return [r for r in range(w.list.count()) if w.list.indexWidget(model.index(r, 0)) is not None]
+
+
+def test_only_visible_rows_get_tiles(qapp, tmp_path):
+    f = tmp_path / "a.txt"
+    f.write_bytes(b"foo bar\n")
+    w = app.MainWindow()
+    w.resize(900, 700)
+    w.show()
+    w.current_options = {"_highlight_rx": {}}
+    n = 150  # more than one batch of the Batched layout (100 rows)
+    w._pending_results.extend(fake_result(f) for _ in range(n))
+    w._flush_queues()
+    settle(qapp)
+    assert w.list.count() == n
+    rows = open_rows(w)
+    assert rows and rows[0] == 0
+    assert len(rows) < 10
+
+    sb = w.list.verticalScrollBar()
+    sb.setValue(sb.maximum())
+    settle(qapp)
+    rows = open_rows(w)
+    assert rows and rows[-1] == n - 1
+    assert len(rows) < 10
+    w.close()
+
+
+def test_hidden_list_does_not_build_every_tile(qapp, tmp_path):
+    f = tmp_path / "a.txt"
+    f.write_bytes(b"foo bar\n")
+    w = app.MainWindow()
+    w.current_options = {"_highlight_rx": {}}
+    n = 101
+    w._pending_results.extend(fake_result(f) for _ in range(n))
+    w._flush_queues()
+    settle(qapp)
+    assert w.list.count() == n
+    assert len(open_rows(w)) < 10
+
+
+def test_rows_added_one_by_one(qapp, tmp_path):
+    # Every insert can resize the scroll range while the view is live
+    f = tmp_path / "a.txt"
+    f.write_bytes(b"foo bar\n")
+    w = app.MainWindow()
+    w.resize(900, 700)
+    w.show()
+    w.current_options = {"_highlight_rx": {}}
+    n = 120
+    for _ in range(n):
+        w._pending_results.append(fake_result(f))
+        w._flush_queues()
+        qapp.processEvents()
+    settle(qapp)
+    assert w.list.count() == n
+    assert 0 < len(open_rows(w)) < 10
+    w.close()